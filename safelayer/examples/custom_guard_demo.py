@@ -1,25 +1,19 @@
 from safelayer.guards.base import BaseGuard
 from safelayer.manager import GuardManager
 
+KEYWORD = "supersecret"
+
 class SecretGuard(BaseGuard):
     def check(self, text):
-        findings = []
-        if "supersecret" in text:
-            findings.append({
-                "entity": "secret",
-                "start": text.index("supersecret"),
-                "end": text.index("supersecret") + len("supersecret"),
-                "explanation": "Found secret keyword"
-            })
-        return findings
+        return self.check_literal(text, [KEYWORD], entity="secret", explanation="Found secret keyword")
 
     def mask(self, text):
-        return text.replace("supersecret", "[REDACTED]")
+        return text.replace(KEYWORD, "[REDACTED]")
 
 # Add your custom guard to the chain!
 guards = [SecretGuard()]
 manager = GuardManager(guards)
 
-response = "This contains supersecret information."
+response = "This contains supersecret information. Another supersecret here."
 sanitized = manager.run(response)
 print("Guarded:", sanitized)
@@ -1,8 +1,161 @@
+import atexit
 import json
+import logging
+import os
+import queue
+import threading
+import time
 from datetime import datetime
 
+# Entries are serialized on the writer thread, so unknown values fall back to
+# str() rather than raising there and stalling the queue.
+try:
+    import orjson
+
+    def _serialize(entry):
+        return orjson.dumps(entry, default=str, option=orjson.OPT_APPEND_NEWLINE)
+except ImportError:
+    def _serialize(entry):
+        return (json.dumps(entry, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+AUDIT_PATH = "audit.log"
+BATCH_SIZE = 64
+FLUSH_INTERVAL = 0.01  # seconds
+
+_log = logging.getLogger(__name__)
+_STOP = object()  # queued by close() to end the writer thread
+
+
+class AuditLogger:
+    """Buffered audit sink: callers enqueue entries, a daemon thread batches the writes."""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path=AUDIT_PATH):
+        self.path = path
+        self.closed = False
+        self._fh = open(path, "ab", buffering=1 << 16)
+        self._queue = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._drain, name="safelayer-audit", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def get(cls):
+        """Process-wide logger, opened on first use (again after close()) and closed at exit."""
+        if cls._instance is None or cls._instance.closed:
+            with cls._instance_lock:
+                if cls._instance is None or cls._instance.closed:
+                    cls._instance = cls()
+        return cls._instance
+
+    def log(self, entry):
+        self._put(entry)
+
+    def log_many(self, entries):
+        """Enqueue a list of entries as one queue item."""
+        self._put(entries)
+
+    def _put(self, item):
+        if self.closed:
+            raise ValueError(f"audit log {self.path} is closed")
+        self._queue.put(item)
+
+    def flush(self, timeout=5.0):
+        """Wait until every entry queued so far has been handled; False on timeout."""
+        if self.closed:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Write what is queued, stop the writer thread and close the file."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._fh.close()
+
+    def _drain(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < BATCH_SIZE and not isinstance(batch[-1], threading.Event) and batch[-1] is not _STOP:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write(batch)
+            except Exception:
+                # A dead writer thread would block flush() forever, so report and carry on.
+                _log.exception("Failed to write audit entries to %s", self.path)
+            finally:
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+            if batch[-1] is _STOP:
+                return
+
+    def _write(self, batch):
+        lines = []
+        for item in batch:
+            if item is _STOP or isinstance(item, threading.Event):
+                continue
+            for entry in item if isinstance(item, list) else (item,):
+                try:
+                    lines.append(_serialize(entry))
+                except Exception:
+                    # Skip just this entry; the rest of the batch is unrelated.
+                    _log.exception("Dropping audit entry that cannot be serialized: %r", entry)
+        self._fh.writelines(lines)
+        self._fh.flush()
+
+
+def _close_at_exit():
+    logger = AuditLogger._instance
+    if logger is not None:
+        logger.close()
+
+
+def _reset_after_fork():
+    # The parent's writer thread does not exist in the child; open a fresh logger on next use.
+    AuditLogger._instance = None
+    AuditLogger._instance_lock = threading.Lock()
+
+
+atexit.register(_close_at_exit)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+_last_second = (None, "")
+
+
+def _timestamp():
+    """Local ISO-8601 time with microseconds; the seconds part is formatted once per second."""
+    global _last_second
+    ns = time.time_ns()
+    sec, frac = divmod(ns, 1_000_000_000)
+    cached_sec, iso = _last_second
+    if sec != cached_sec:
+        iso = datetime.fromtimestamp(sec).isoformat()
+        _last_second = (sec, iso)
+    return f"{iso}.{frac // 1000:06d}"
+
+
 def audit_log(**kwargs):
     entry = dict(**kwargs)
-    entry["timestamp"] = datetime.now().isoformat()
-    with open("audit.log", "a") as logf:
-        logf.write(json.dumps(entry) + "\n")
+    entry["timestamp"] = _timestamp()
+    AuditLogger.get().log(entry)
+
+
+def audit_log_many(guard, findings):
+    """Log every finding of one guard with a shared timestamp in a single enqueue."""
+    timestamp = _timestamp()
+    AuditLogger.get().log_many([dict(guard=guard, **f, timestamp=timestamp) for f in findings])
@@ -1,10 +1,23 @@
+import inspect
 from functools import wraps
 
+def _takes_no_arguments(func):
+    try:
+        return not inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return False
+
 def apply_guards(manager):
     def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
-            result = func(*args, **kwargs)
-            return manager.run(result)
+        run = manager.run
+        if _takes_no_arguments(func):
+            # Most guarded agent replies take no arguments; skip *args/**kwargs packing.
+            @wraps(func)
+            def wrapper():
+                return run(func())
+        else:
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                return run(func(*args, **kwargs))
         return wrapper
     return decorator
@@ -0,0 +1,50 @@
+"""Regex engine selection for guard patterns.
+
+Guards compile their internal patterns through ``compile_pattern``. When
+Google RE2 is installed (``pip install google-re2``), ASCII text is matched by
+RE2's linear-time automaton. RE2's ``\\w``, ``\\d`` and ``\\b`` are
+ASCII-only, so non-ASCII text stays on the stdlib ``re`` engine to keep Unicode
+matching unchanged; there it can still backtrack, so patterns must bound their
+repeats themselves rather than rely on RE2.
+"""
+
+import re
+
+try:
+    import re2
+    RE2 = True
+except ImportError:
+    RE2 = False
+
+
+class HybridPattern:
+    """Subset of ``re.Pattern`` that routes ASCII text to RE2."""
+
+    def __init__(self, pattern, flags=0):
+        self.pattern = pattern
+        self._py = re.compile(pattern, flags)
+        self.flags = self._py.flags
+        self._re2 = re2.compile(f"(?i:{pattern})" if flags & re.I else pattern)
+
+    def _engine(self, text):
+        return self._re2 if text.isascii() else self._py
+
+    def search(self, text):
+        return self._engine(text).search(text)
+
+    def finditer(self, text):
+        return self._engine(text).finditer(text)
+
+    def sub(self, repl, text):
+        return self._engine(text).sub(repl, text)
+
+
+def compile_pattern(pattern, flags=0):
+    """Compile with RE2 for ASCII input when available, otherwise plain ``re``."""
+    if not RE2 or flags & ~re.I:
+        return re.compile(pattern, flags)
+    try:
+        return HybridPattern(pattern, flags)
+    except re2.error:
+        # Syntax RE2 does not support (backreferences, lookaround).
+        return re.compile(pattern, flags)
@@ -1,7 +1,17 @@
+import sys
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 class BaseGuard(ABC):
+    # True when every replacement is a fixed token that cannot join with the
+    # surrounding text into a new match for guards later in the chain. Guards
+    # that delete text (or whose replacements vary) leave it False, and
+    # GuardManager then makes later guards scan this guard's output.
+    fixed_token_masks = False
+    # True when no match can contain whitespace outside a ``<...>`` tag, so
+    # StreamSession may sanitize a stream up to its last whitespace early.
+    stream_safe = False
+
     def __init__(self, explain: bool = False):
         self.explain = explain
 
@@ -13,6 +23,75 @@ class BaseGuard(ABC):
     def mask(self, text: str) -> str:
         ...
 
-    def explain_action(self, details: Dict[str, Any]):
+    def mask_all(self, text: str, findings: List[Dict[str, Any]]) -> str:
+        """Mask ``text`` given the findings ``check(text)`` just returned.
+
+        GuardManager calls this only for guards on the check/mask path, that
+        is, guards without ``spans()`` or ``patterns()``. The default ignores
+        the findings and calls ``mask`` once; such guards can splice their
+        findings directly instead of scanning again.
+        """
+        return self.mask(text)
+
+    def patterns(self) -> List[Tuple[str, Optional[str], Callable[[str, int, int], Dict[str, Any]]]]:
+        """Return ``(regex, replacement, finding)`` triples for a span scan.
+
+        Guards that can express detection as plain regexes (no numbered
+        backreferences, flags given inline) let GuardManager scan them as one
+        regex and merge the edits with neighbouring guards'. ``finding(text,
+        start, end)`` builds the same dict ``check()`` reports for that match,
+        so audit entries do not depend on the path taken. Replacements must be
+        strings: a branch consumes its match, so detect-only guards belong in
+        ``spans()`` instead. The default empty list keeps a guard on the
+        regular check/mask path.
+        """
+        return []
+
+    def spans(self, text: str) -> Optional[List[Tuple[Dict[str, Any], Optional[str]]]]:
+        """Return ``(finding, replacement)`` pairs located on ``text``.
+
+        Findings need ``start``/``end`` offsets; a ``None`` replacement reports
+        the finding without masking it. Overriding this lets
+        GuardManager merge the guard's edits with its neighbours' and rebuild
+        the text once; it takes precedence over ``patterns()``, so guards with
+        a faster scan of their own (prefilters, automata) should use it.
+        """
+        return None
+
+    def check_literal(self, text: str, keywords: Sequence[str], entity: str,
+                      explanation: str = "") -> List[Dict[str, Any]]:
+        """Report every non-overlapping occurrence of each keyword, in text order."""
+        results = []
+        for kw in keywords:
+            klen = len(kw)
+            if not klen:
+                continue
+            i = text.find(kw)
+            while i >= 0:
+                results.append({"entity": entity, "start": i, "end": i + klen,
+                                "explanation": explanation or f"{entity}: {kw} @ {(i, i + klen)}"})
+                i = text.find(kw, i + klen)
+        results.sort(key=lambda f: f["start"])
+        return results
+
+    def explain_action(self, details: Dict[str, Any], collector: Optional[List[str]] = None):
+        """Write the explanation to stderr, or append it to ``collector`` for a batched write."""
         if self.explain:
-            print(f"[{self.__class__.__name__}][EXPLAIN]", details.get("explanation", ""))
+            line = f"[{self.__class__.__name__}][EXPLAIN] {details.get('explanation', '')}\n"
+            if collector is None:
+                sys.stderr.write(line)
+            else:
+                collector.append(line)
+
+def splice(text: str, spans: Sequence[Tuple[int, int, str]]) -> str:
+    """Apply sorted, non-overlapping ``(start, end, replacement)`` spans in one join."""
+    if not spans:
+        return text
+    parts = []
+    pos = 0
+    for start, end, replacement in spans:
+        parts.append(text[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(text[pos:])
+    return "".join(parts)
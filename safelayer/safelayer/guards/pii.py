@@ -1,4 +1,6 @@
+import functools
 import re
+from ..engine import compile_pattern
 from .base import BaseGuard
 
 try:
@@ -7,28 +9,69 @@ try:
 except ImportError:
     PRESIDIO = False
 
-EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+# The local part is capped at RFC 5321's 64 characters, and the domain at 255,
+# so a failed match backtracks over a bounded span even on the ``re`` engine.
+EMAIL_RE = re.compile(r'[\w\.-]{1,64}@[\w\.-]{1,255}\.\w+')
 PHONE_RE = re.compile(r'\b\d{10}\b')
+_PII_RE = compile_pattern(f'(?P<email>{EMAIL_RE.pattern})|(?P<phone>{PHONE_RE.pattern})')
+_PHONE_ONLY_RE = compile_pattern(f'(?P<phone>{PHONE_RE.pattern})')
+_DIGIT_RE = compile_pattern(r'\d')
+_PRESIDIO_ENTITIES = ["EMAIL_ADDRESS", "PHONE_NUMBER"]
+_MASKS = {"email": "[EMAIL MASKED]", "phone": "[PHONE MASKED]",
+          "EMAIL_ADDRESS": "[EMAIL MASKED]", "PHONE_NUMBER": "[PHONE MASKED]"}
+
+def _finding(kind, text, start, end):
+    return {"entity": kind, "start": start, "end": end, "explanation": f"{kind.upper()}: {text[start:end]} @ {(start, end)}"}
+
+def _select(text):
+    """Cheapest regex that can still match ``text``, or None when nothing can.
+
+    Every email contains an ``@`` and every phone number a digit, so a C-level
+    ``in`` test and one digit search let clean text skip the email branch,
+    whose local-part class would otherwise be tried at every word character.
+    """
+    if "@" in text:
+        return _PII_RE
+    if _DIGIT_RE.search(text):
+        return _PHONE_ONLY_RE
+    return None
+
+@functools.lru_cache(maxsize=1)
+def _get_analyzer():
+    """One AnalyzerEngine per process; loading its NLP pipeline takes seconds."""
+    return AnalyzerEngine()
 
 class PIIGuard(BaseGuard):
+    fixed_token_masks = True
+
     def __init__(self, mask=True, explain=False):
         super().__init__(explain)
-        self.mask = mask
-        self.engine = AnalyzerEngine() if PRESIDIO else None
+        self.mask_enabled = mask
+        self.engine = _get_analyzer() if PRESIDIO else None
+
+    @property
+    def stream_safe(self):
+        # Presidio recognizes phone numbers written with spaces.
+        return not (PRESIDIO and self.engine)
 
     def check(self, text: str):
         results = []
         if PRESIDIO and self.engine:
-            hits = self.engine.analyze(text=text, entities=["EMAIL_ADDRESS", "PHONE_NUMBER"], language="en")
+            hits = self.engine.analyze(text=text, entities=_PRESIDIO_ENTITIES, language="en")
             for h in hits:
                 results.append({"entity": h.entity_type, "start": h.start, "end": h.end, "explanation": f"Presidio: {h.entity_type} @ {h.start}-{h.end}"})
         else:
-            for m in EMAIL_RE.finditer(text):
-                results.append({"entity": "email", "start": m.start(), "end": m.end(), "explanation": f"EMAIL: {m.group()} @ {m.span()}"})
-            for m in PHONE_RE.finditer(text):
-                results.append({"entity": "phone", "start": m.start(), "end": m.end(), "explanation": f"PHONE: {m.group()} @ {m.span()}"})
+            regex = _select(text)
+            for m in regex.finditer(text) if regex else ():
+                results.append(_finding(m.lastgroup, text, m.start(), m.end()))
         return results
 
+    def spans(self, text: str):
+        masks = _MASKS if self.mask_enabled else {}
+        return [(f, masks.get(f["entity"])) for f in self.check(text)]
+
     def mask(self, text: str) -> str:
-        text = EMAIL_RE.sub("[EMAIL MASKED]", text)
-        return PHONE_RE.sub("[PHONE MASKED]", text)
+        regex = _select(text) if self.mask_enabled else None
+        if regex is None:
+            return text
+        return regex.sub(lambda m: _MASKS[m.lastgroup], text)
@@ -1,23 +1,65 @@
-from .base import BaseGuard
+from ..engine import compile_pattern
+from .base import BaseGuard, splice
 import re
 
+try:
+    import ahocorasick
+    AHOCORASICK = True
+except ImportError:
+    AHOCORASICK = False
+
 PROFANITY = {"damn", "crap", "shit", "fuck"}
-PROF_RE = re.compile(r'\b(' + '|'.join(re.escape(w) for w in PROFANITY) + r')\b', re.I)
+PROF_RE = re.compile(r'\b(?:' + '|'.join(re.escape(w) for w in PROFANITY) + r')\b', re.I)
+_PROF_RE = compile_pattern(PROF_RE.pattern, re.I)
+
+if AHOCORASICK:
+    _AUTOMATON = ahocorasick.Automaton()
+    for _w in PROFANITY:
+        _AUTOMATON.add_word(_w, len(_w))
+    _AUTOMATON.make_automaton()
+
+def _is_word(ch):
+    return ch.isalnum() or ch == "_"
+
+def _profanity_spans(text):
+    """(start, end) of whole-word profanity hits, in text order."""
+    if not AHOCORASICK or not text.isascii():
+        # str.lower is not re.I folding (LONG S matches "s" only under re.I)
+        # and can change the length, so only ASCII text uses the automaton.
+        return [m.span() for m in _PROF_RE.finditer(text)]
+    low = text.lower()
+    spans = []
+    last_end = 0
+    for end, length in _AUTOMATON.iter(low):
+        start, stop = end - length + 1, end + 1
+        if start < last_end:
+            continue
+        if (start > 0 and _is_word(low[start - 1])) or (stop < len(low) and _is_word(low[stop])):
+            continue
+        spans.append((start, stop))
+        last_end = stop
+    return spans
+
+def _finding(text, start, end):
+    return {
+        "entity": "profanity",
+        "start": start,
+        "end": end,
+        "explanation": f"Profanity '{text[start:end]}' @ {(start, end)}"}
 
 class ToneGuard(BaseGuard):
+    fixed_token_masks = True
+    stream_safe = True
+
     def __init__(self, warn_only=True, explain=False):
         super().__init__(explain)
         self.warn_only = warn_only
 
     def check(self, text):
-        results = []
-        for m in PROF_RE.finditer(text):
-            results.append({
-                "entity": "profanity",
-                "start": m.start(),
-                "end": m.end(),
-                "explanation": f"Profanity '{m.group()}' @ {m.span()}"})
-        return results
+        return [_finding(text, start, end) for start, end in _profanity_spans(text)]
+
+    def spans(self, text):
+        return [(_finding(text, start, end), "****") for start, end in _profanity_spans(text)]
 
     def mask(self, text):
-        return PROF_RE.sub("****", text)
+        return splice(text, [(start, end, "****") for start, end in _profanity_spans(text)])
@@ -1,20 +1,52 @@
+from ..engine import compile_pattern
 from .base import BaseGuard
 import re
 
-INVALID_TTS_PATTERNS = [r'<[^>]*script', r'[^\x00-\x7F]+']
+# The tag class also stops at '<', so each '<' is only scanned up to the next
+# one and a run of unclosed tags no longer backtracks quadratically.
+INVALID_TTS_PATTERNS = [r'<[^<>]*script', r'[^\x00-\x7F]+']
+_TTS_GROUPS = {"script": INVALID_TTS_PATTERNS[0], "nonascii": INVALID_TTS_PATTERNS[1]}
+# Only the tag match ignores case: under re.I, code points that fold into ASCII
+# (KELVIN SIGN, LONG S) would count as inside ``\x00-\x7F`` and survive.
+_TTS_SOURCES = {"script": f"(?i:{_TTS_GROUPS['script']})", "nonascii": _TTS_GROUPS["nonascii"]}
+_TTS_RE = compile_pattern('|'.join(f'(?P<{name}>{p})' for name, p in _TTS_SOURCES.items()))
+_SCRIPT_RE = compile_pattern(f'(?P<script>{_TTS_SOURCES["script"]})')
+_NON_ASCII_RE = compile_pattern(f'(?P<nonascii>{_TTS_SOURCES["nonascii"]})')
+
+def _select(text):
+    """Cheapest regex that can still match ``text``, or None when nothing can.
+
+    ``str.isascii`` and the ``"<"`` membership test are single C loops, so
+    plain-ASCII text without markup never reaches the regex engine.
+    """
+    has_tag = "<" in text
+    if text.isascii():
+        return _SCRIPT_RE if has_tag else None
+    return _TTS_RE if has_tag else _NON_ASCII_RE
+
+def _finding(name, text, start, end):
+    pattern = _TTS_GROUPS[name]
+    return {"entity": "invalid_tts", "pattern": pattern, "start": start, "end": end,
+            "explanation": f"Invalid pattern matched: {pattern}"}
 
 class TTSGuard(BaseGuard):
+    stream_safe = True
+
     def __init__(self, explain=False):
         super().__init__(explain)
 
     def check(self, text):
         results = []
-        for pattern in INVALID_TTS_PATTERNS:
-            if re.search(pattern, text, re.I):
-                results.append({"entity": "invalid_tts", "pattern": pattern, "explanation": f"Invalid pattern matched: {pattern}"})
+        regex = _select(text)
+        if regex is None:
+            return results
+        for m in regex.finditer(text):
+            results.append(_finding(m.lastgroup, text, m.start(), m.end()))
         return results
 
+    def spans(self, text):
+        return [(f, "") for f in self.check(text)]
+
     def mask(self, text):
-        t = re.sub(INVALID_TTS_PATTERNS[0], "", text)
-        t = re.sub(INVALID_TTS_PATTERNS[1], "", t)
-        return t
+        regex = _select(text)
+        return text if regex is None else regex.sub("", text)
@@ -1,14 +1,166 @@
-from .audit import audit_log
+import bisect
+import functools
+import sys
+
+from .audit import audit_log_many
+from .engine import compile_pattern
+from .guards.base import BaseGuard, splice
+
+
+def _provides_spans(guard):
+    return bool(guard.patterns()) or type(guard).spans is not BaseGuard.spans
+
+
+def _resolve_overlaps(hits):
+    """Keep non-overlapping hits, earlier guards first, returned in text order."""
+    starts, ends, kept = [], [], []
+    for hit in sorted(hits, key=lambda h: h[0]):
+        start, end = hit[2]["start"], hit[2]["end"]
+        i = bisect.bisect_right(starts, start)
+        if (i and ends[i - 1] > start) or (i < len(starts) and starts[i] < end):
+            continue
+        starts.insert(i, start)
+        ends.insert(i, end)
+        kept.insert(i, hit)
+    return kept
+
+
+class _PatternScanner:
+    """One regex over a guard's ``patterns()``; ``m.lastgroup`` maps a match to its branch."""
+
+    def __init__(self, patterns):
+        self.table = {}
+        branches = []
+        seen = set()
+        for pi, (pattern, replacement, make_finding) in enumerate(patterns):
+            if pattern in seen:
+                # Every branch masks, so the earlier branch with the same regex
+                # always matches first and consumes the text; this one never wins.
+                continue
+            seen.add(pattern)
+            name = f"p{pi}"
+            branches.append(f"(?P<{name}>{pattern})")
+            self.table[name] = (replacement, make_finding)
+        self.regex = compile_pattern("|".join(branches))
+
+    def __call__(self, text):
+        hits = []
+        for m in self.regex.finditer(text):
+            replacement, make_finding = self.table[m.lastgroup]
+            hits.append((make_finding(text, m.start(), m.end()), replacement))
+        return hits
+
+
+class _SpanStage:
+    """Adjacent guards whose edits are known as spans, applied in one splice.
+
+    Each guard scans the stage's input on its own, through ``spans()`` or a
+    regex built from its ``patterns()``, so its cheap prefilters still apply.
+    All spans are located on the stage's input text, which is only sound
+    because every guard but the last masks with fixed tokens
+    (``fixed_token_masks``): no edit can create text a later guard in the
+    stage would have matched. Where spans of two guards overlap, the earlier
+    guard's wins and the later one is neither applied nor audited, since
+    running the guards in turn would have masked that text first.
+    """
 
-class GuardManager:
     def __init__(self, guards):
         self.guards = guards
+        self.scanners = []
+        for gi, guard in enumerate(guards):
+            if type(guard).spans is not BaseGuard.spans:
+                self.scanners.append((gi, guard, guard.spans))
+            else:
+                self.scanners.append((gi, guard, _PatternScanner(guard.patterns())))
 
-    def run(self, text):
-        for guard in self.guards:
+    def _hits(self, text):
+        edits, detects = [], []
+        for gi, guard, scan in self.scanners:
+            for finding, replacement in scan(text) or ():
+                # Detect-only hits leave the text untouched, so they never hide
+                # it from later guards and take no part in overlap resolution.
+                (detects if replacement is None else edits).append((gi, guard, finding, replacement))
+        return sorted(_resolve_overlaps(edits) + detects, key=lambda h: h[2]["start"])
+
+    def run(self, text, events):
+        spans = []
+        by_guard = [[] for _ in self.guards]
+        for gi, _, finding, replacement in self._hits(text):
+            by_guard[gi].append(finding)
+            if replacement is not None:
+                spans.append((finding["start"], finding["end"], replacement))
+        events.extend((guard, findings) for guard, findings in zip(self.guards, by_guard) if findings)
+        return splice(text, spans)
+
+
+class GuardManager:
+    """Runs guards in order, auditing and explaining every finding.
+
+    Results are memoised per input text (up to ``cache_size`` distinct texts
+    shorter than ``CACHE_MAX_LEN``), so repeated canned strings skip scanning.
+    Audit entries and explanations are still emitted on every call. Pass
+    ``cache_size=0`` for guards whose output is not a pure function of the text.
+    The guard sequence is fixed at construction; build a new manager to change it.
+    """
+
+    CACHE_MAX_LEN = 4096
+
+    def __init__(self, guards, cache_size=1024):
+        # A tuple, since the stages are built from it once: appending to a
+        # list here would silently not run.
+        self.guards = tuple(guards)
+        self._stages = self._build_stages(self.guards)
+        self._cached_scan = functools.lru_cache(maxsize=cache_size)(self._scan) if cache_size else None
+
+    @staticmethod
+    def _build_stages(guards):
+        stages = []
+        pending = []
+        for guard in guards:
+            if _provides_spans(guard):
+                pending.append(guard)
+                if not guard.fixed_token_masks:
+                    # Its edits can join neighbouring text into new matches, so
+                    # the guards after it must scan its output, not its input.
+                    stages.append(_SpanStage(pending))
+                    pending = []
+                continue
+            if pending:
+                stages.append(_SpanStage(pending))
+                pending = []
+            stages.append(guard)
+        if pending:
+            stages.append(_SpanStage(pending))
+        return stages
+
+    def _scan(self, text):
+        events = []
+        for stage in self._stages:
+            if isinstance(stage, _SpanStage):
+                text = stage.run(text, events)
+                continue
+            guard = stage
             findings = guard.check(text)
-            for finding in findings:
-                audit_log(guard=guard.__class__.__name__, **finding)
-                guard.explain_action(finding)
-                text = guard.mask(text)
+            if findings:
+                events.append((guard, findings))
+                text = guard.mask_all(text, findings)
+        return text, tuple(events)
+
+    def run(self, text):
+        if self._cached_scan is not None and len(text) < self.CACHE_MAX_LEN:
+            text, events = self._cached_scan(text)
+        else:
+            text, events = self._scan(text)
+        explanations = []
+        for guard, findings in events:
+            audit_log_many(guard.__class__.__name__, findings)
+            if guard.explain:
+                for finding in findings:
+                    guard.explain_action(finding, explanations)
+        if explanations:
+            sys.stderr.write("".join(explanations))
         return text
+
+    def clear_cache(self):
+        if self._cached_scan is not None:
+            self._cached_scan.cache_clear()
@@ -1,3 +1,96 @@
+"""Optional real-time API for SafeLayer guardrails.
+
+Exposes a GuardManager over HTTP and WebSocket when FastAPI is installed.
+``/ws`` sanitizes each message on its own; ``/ws/stream`` accepts a token
+stream and emits masked deltas, re-scanning only the text not yet emitted;
+it is registered only when every guard is ``stream_safe``.
+"""
+
+import json
+from typing import Dict, List
+
+from .guards.base import BaseGuard
+from .manager import GuardManager
+
+try:
+    from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+    from pydantic import BaseModel
+    FASTAPI_AVAILABLE = True
+except ImportError:
+    FASTAPI_AVAILABLE = False
+
+if FASTAPI_AVAILABLE:
+    class _TextIn(BaseModel):
+        text: str
+
+
+# Longest unsettled tail a stream may hold back. Emitting a longer one early
+# could split a match, so the stream is rejected instead.
+MAX_HOLD = 4096
+_WHITESPACE = (" ", "\n", "\t", "\r")
+
+
+def _safe_cut(text: str) -> int:
+    """Length of the prefix of ``text`` no future input can change the masking of.
+
+    Matches of stream-safe guards never contain whitespace, apart from the TTS
+    ``<...script`` pattern, which cannot continue past a ``>``. So the prefix
+    ends after the last whitespace character that does not lie between a
+    ``<`` and the next ``>`` (or the end of the text, for an unclosed tag).
+    """
+    cut = max(text.rfind(ch) for ch in _WHITESPACE) + 1
+    while True:
+        lt = text.find("<", text.rfind(">", 0, cut) + 1, cut)
+        if lt == -1:
+            break
+        # Whitespace inside the tag may itself sit in an earlier tag, so retry.
+        cut = max(text.rfind(ch, 0, lt) for ch in _WHITESPACE) + 1
+    return cut
+
+
+class StreamSession:
+    """Incrementally sanitizes a token stream for one connection.
+
+    Only the unsettled tail is kept and re-scanned, so each update costs
+    O(token) instead of O(total text). Every guard must be ``stream_safe``;
+    guards whose matches may span whitespace need the per-message endpoint.
+    """
+
+    def __init__(self, manager: GuardManager, max_hold: int = MAX_HOLD):
+        unsafe = [type(g).__name__ for g in manager.guards if not g.stream_safe]
+        if unsafe:
+            raise ValueError(f"Guards not safe for streaming: {', '.join(unsafe)}")
+        self.manager = manager
+        self.max_hold = max_hold
+        self._pending = ""
+
+    def feed(self, chunk: str) -> str:
+        """Add ``chunk`` and return the masked text that is now settled.
+
+        Raises ``ValueError`` (and drops the held text) once the unsettled
+        tail exceeds ``max_hold``.
+        """
+        pending = self._pending + chunk
+        cut = _safe_cut(pending)
+        if len(pending) - cut > self.max_hold:
+            self._pending = ""
+            raise ValueError(f"stream held more than {self.max_hold} characters without a safe cut")
+        self._pending = pending[cut:]
+        return self.manager.run(pending[:cut]) if cut else ""
+
+    def close(self) -> str:
+        """Mask and return whatever is still held back."""
+        pending, self._pending = self._pending, ""
+        return self.manager.run(pending) if pending else ""
+
+
+class StreamingServer:
+    def __init__(self, guards: List[BaseGuard]):
+        self.manager = GuardManager(guards)
+        # /ws/stream is only served when StreamSession can honour every guard.
+        self.streaming = all(g.stream_safe for g in guards)
         self.app = None
         if FASTAPI_AVAILABLE:
             self._build_app()
@@ -38,6 +131,32 @@
             except WebSocketDisconnect:
                 pass
 
+        if self.streaming:
+            @app.websocket("/ws/stream")
+            async def ws_stream_endpoint(ws: WebSocket):
+                await ws.accept()
+                session = StreamSession(self.manager)
+                try:
+                    while True:
+                        raw = await ws.receive_text()
+                        try:
+                            data = json.loads(raw)
+                            chunk = data.get("text", "")
+                            final = bool(data.get("final", False))
+                        except Exception:
+                            chunk, final = raw, False
+                        try:
+                            masked = session.feed(chunk)
+                        except ValueError:
+                            await ws.close(code=1009)
+                            return
+                        if final:
+                            masked += session.close()
+                        if masked or final:
+                            await ws.send_text(json.dumps({"output": masked, "final": final}))
+                except WebSocketDisconnect:
+                    pass
+
         self.app = app
 
     def run(self, host: str = "0.0.0.0", port: int = 8080):
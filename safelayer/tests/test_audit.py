@@ -0,0 +1,93 @@
+import json
+import logging
+
+import pytest
+
+from safelayer import audit as audit_mod
+from safelayer.audit import AuditLogger
+
+@pytest.fixture
+def logger(tmp_path):
+    logger = AuditLogger(str(tmp_path / "audit.log"))
+    yield logger
+    logger.close()
+
+def _lines(logger):
+    with open(logger.path) as fh:
+        return [json.loads(line) for line in fh]
+
+def test_logger_batches_entries_to_file(logger):
+    for i in range(100):
+        logger.log({"guard": "PIIGuard", "entity": "email", "start": i})
+    assert logger.flush()
+    assert [entry["start"] for entry in _lines(logger)] == list(range(100))
+
+def test_timestamp_is_iso_with_microseconds():
+    from datetime import datetime
+    from safelayer.audit import _timestamp
+    first, second = _timestamp(), _timestamp()
+    assert datetime.fromisoformat(first) <= datetime.fromisoformat(second)
+    assert len(first.rsplit(".", 1)[1]) == 6
+
+def test_logger_serializes_unknown_values_as_str(logger):
+    logger.log({"guard": "ToneGuard", "obj": object})
+    logger.flush()
+    [entry] = _lines(logger)
+    assert entry["guard"] == "ToneGuard"
+    assert "object" in entry["obj"]
+
+def test_log_many_writes_each_entry(logger):
+    logger.log_many([{"start": 0}, {"start": 5}])
+    logger.log({"start": 9})
+    logger.flush()
+    assert [entry["start"] for entry in _lines(logger)] == [0, 5, 9]
+
+def test_unserializable_entry_is_skipped_and_reported(logger, caplog):
+    cyclic = {"start": 2}
+    cyclic["self"] = cyclic
+    with caplog.at_level(logging.ERROR, logger="safelayer.audit"):
+        logger.log_many([{"start": 1}, cyclic, {"start": 3}])
+        logger.log({"start": 4})
+        assert logger.flush()
+    assert "cannot be serialized" in caplog.text
+    assert [entry["start"] for entry in _lines(logger)] == [1, 3, 4]
+
+def test_failed_write_is_reported_and_releases_flush(logger, monkeypatch, caplog):
+    class BrokenFile:
+        def writelines(self, lines):
+            raise OSError("disk full")
+
+    real = logger._fh
+    monkeypatch.setattr(logger, "_fh", BrokenFile())
+    with caplog.at_level(logging.ERROR, logger="safelayer.audit"):
+        logger.log({"start": 0})
+        assert logger.flush()
+    assert "Failed to write audit entries" in caplog.text
+    logger._fh = real
+    logger.log({"start": 1})
+    assert logger.flush()
+    assert _lines(logger) == [{"start": 1}]
+
+def test_close_writes_pending_entries_and_stops(logger):
+    logger.log({"start": 3})
+    logger.close()
+    assert _lines(logger) == [{"start": 3}]
+    assert not logger._thread.is_alive()
+    assert logger._fh.closed
+    with pytest.raises(ValueError):
+        logger.log({"start": 4})
+
+def test_get_replaces_closed_and_forked_instances(logger, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(AuditLogger, "_instance", logger)
+    monkeypatch.setattr(AuditLogger, "_instance_lock", AuditLogger._instance_lock)
+    assert AuditLogger.get() is logger
+    audit_mod._reset_after_fork()
+    assert AuditLogger._instance is None
+    AuditLogger._instance = logger
+    logger.close()
+    fresh = AuditLogger.get()
+    try:
+        assert fresh is not logger and not fresh.closed
+    finally:
+        fresh.close()
@@ -0,0 +1,13 @@
+from safelayer.guards.base import BaseGuard
+
+class _KeywordGuard(BaseGuard):
+    def check(self, text):
+        return self.check_literal(text, ["secret", "key"], entity="secret")
+
+    def mask(self, text):
+        return text
+
+def test_check_literal_reports_every_hit_in_order():
+    findings = _KeywordGuard().check("key secret, secretsecret")
+    assert [(f["start"], f["end"]) for f in findings] == [(0, 3), (4, 10), (12, 18), (18, 24)]
+    assert all(f["entity"] == "secret" for f in findings)
@@ -0,0 +1,18 @@
+from safelayer.decorators import apply_guards
+from safelayer.guards.pii import PIIGuard
+from safelayer.manager import GuardManager
+
+manager = GuardManager([PIIGuard()])
+
+def test_zero_argument_function_is_guarded():
+    @apply_guards(manager)
+    def reply():
+        return "Write to jill@xyz.com"
+    assert reply() == "Write to [EMAIL MASKED]"
+    assert reply.__name__ == "reply"
+
+def test_arguments_are_forwarded():
+    @apply_guards(manager)
+    def reply(name, domain="xyz.com"):
+        return f"Write to {name}@{domain}"
+    assert reply("jill", domain="abc.org") == "Write to [EMAIL MASKED]"
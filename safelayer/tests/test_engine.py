@@ -0,0 +1,42 @@
+import re
+import time
+
+import pytest
+
+from safelayer.engine import compile_pattern
+from safelayer.guards.pii import EMAIL_RE, PIIGuard
+
+def test_compiled_pattern_matches_like_re():
+    regex = compile_pattern(r'(?P<word>\bdamn\b)|(?P<num>\d+)', re.I)
+    assert [(m.lastgroup, m.group()) for m in regex.finditer("DAMN 42 damned")] == [("word", "DAMN"), ("num", "42")]
+    assert regex.sub("#", "Damn, café 7") == "#, café #"
+    assert regex.search("nothing") is None
+
+def test_unicode_email_still_masked():
+    assert PIIGuard().mask("écrire à josé@exemple.fr") == "écrire à [EMAIL MASKED]"
+    assert EMAIL_RE.search("josé@exemple.fr").group() == "josé@exemple.fr"
+
+def test_public_patterns_are_stdlib_regexes():
+    from safelayer.guards.tone import PROF_RE
+    from safelayer.guards.pii import PHONE_RE
+    assert all(isinstance(p, re.Pattern) for p in (EMAIL_RE, PHONE_RE, PROF_RE))
+
+def test_non_ascii_email_scan_is_bounded():
+    text = "é" + "a" * 20000 + "@"
+    start = time.perf_counter()
+    assert PIIGuard().mask(text) == text
+    assert time.perf_counter() - start < 0.5
+
+@pytest.mark.parametrize("text", [
+    "Mail jane.doe@example.com or 9876543210, DAMN <x script>",
+    "écrire à josé@exemple.fr, 9876543210 ünï damn",
+])
+def test_hybrid_pattern_matches_like_re(text):
+    pytest.importorskip("re2")
+    from safelayer.engine import HybridPattern
+    source = f"(?P<email>{EMAIL_RE.pattern})|(?P<phone>\\b\\d{{10}}\\b)|(?P<word>\\bdamn\\b)|(?P<tag><[^<>]*script)"
+    hybrid, plain = HybridPattern(source, re.I), re.compile(source, re.I)
+    assert [(m.lastgroup, m.span()) for m in hybrid.finditer(text)] == \
+        [(m.lastgroup, m.span()) for m in plain.finditer(text)]
+    assert hybrid.sub("#", text) == plain.sub("#", text)
+    assert (hybrid.search(text) is None) == (plain.search(text) is None)
@@ -9,3 +9,153 @@ def test_manager_cleans_text():
     output = manager.run(input_str)
     assert "[EMAIL MASKED]" in output
     assert "****" in output
+
+def test_manager_merges_builtin_guards_into_one_stage():
+    from safelayer.guards.tts import TTSGuard
+    manager = GuardManager([PIIGuard(), ToneGuard(), TTSGuard()])
+    assert len(manager._stages) == 1
+    output = manager.run("Mail a@b.com or 9876543210, damn <script>x() ¡hola!")
+    assert output == "Mail [EMAIL MASKED] or [PHONE MASKED], **** >x() hola!"
+
+def test_manager_respects_pii_mask_disabled():
+    manager = GuardManager([PIIGuard(mask=False), ToneGuard()])
+    assert manager.run("foo@bar.com crap") == "foo@bar.com ****"
+
+def test_manager_merges_span_guards_earlier_guard_wins():
+    from safelayer.guards.base import BaseGuard
+
+    class CodeGuard(BaseGuard):
+        fixed_token_masks = True
+
+        def check(self, text):
+            i = text.find("foo@bar")
+            return [{"entity": "code", "start": i, "end": i + 7}] if i >= 0 else []
+
+        def spans(self, text):
+            return [(f, "[CODE]") for f in self.check(text)]
+
+        def mask(self, text):
+            return text.replace("foo@bar", "[CODE]")
+
+    manager = GuardManager([CodeGuard(), PIIGuard(), ToneGuard()])
+    assert len(manager._stages) == 1
+    assert manager.run("foo@bar.com damn") == "[CODE].com ****"
+
+def test_manager_cache_replays_audit(monkeypatch):
+    import safelayer.manager as manager_mod
+    logged = []
+    monkeypatch.setattr(manager_mod, "audit_log_many", lambda guard, findings: logged.extend(findings))
+    guard = ToneGuard()
+    manager = GuardManager([guard])
+    assert manager.run("crap") == manager.run("crap") == "****"
+    assert manager._cached_scan.cache_info().hits == 1
+    assert len(logged) == 2
+    manager.clear_cache()
+    assert manager._cached_scan.cache_info().currsize == 0
+
+def test_manager_writes_explanations_once_to_stderr(capsys):
+    manager = GuardManager([ToneGuard(explain=True)])
+    manager.run("crap and damn")
+    captured = capsys.readouterr()
+    assert captured.out == ""
+    assert captured.err.count("[ToneGuard][EXPLAIN]") == 2
+
+def test_manager_drops_shadowed_duplicate_patterns():
+    from safelayer.guards.base import BaseGuard
+
+    class DupGuard(BaseGuard):
+        fixed_token_masks = True
+
+        def check(self, text):
+            return []
+
+        def mask(self, text):
+            return text
+
+        def patterns(self):
+            return [(r"\d+", "#", lambda text, start, end: {"start": start, "end": end}),
+                    (r"\d+", "?", lambda text, start, end: {})]
+
+    manager = GuardManager([PIIGuard(), DupGuard(), PIIGuard()])
+    (stage,) = manager._stages
+    assert len(stage.scanners[1][2].table) == 1
+    assert manager.run("a@b.com 42") == "[EMAIL MASKED] #"
+
+def test_overlapping_spans_go_to_the_earlier_guard(monkeypatch):
+    import safelayer.manager as manager_mod
+    from safelayer.guards.tts import TTSGuard
+    cases = [
+        ([PIIGuard(), TTSGuard()], "<x jane@script.com", "<x [EMAIL MASKED]", ["email"]),
+        ([ToneGuard(), PIIGuard()], "foo.damn@bar.com", "foo.****@bar.com", ["profanity"]),
+    ]
+    for guards, text, expected, entities in cases:
+        logged = []
+        monkeypatch.setattr(manager_mod, "audit_log_many", lambda name, findings: logged.extend(findings))
+        assert GuardManager(guards).run(text) == expected
+        assert [f["entity"] for f in logged] == entities
+        sequential = text
+        for guard in guards:
+            sequential = guard.mask(sequential)
+        assert sequential == expected
+
+def test_manager_masks_plain_guard_once_per_run():
+    from safelayer.guards.base import BaseGuard
+
+    class CountingGuard(BaseGuard):
+        calls = 0
+
+        def check(self, text):
+            return self.check_literal(text, ["secret"], entity="secret")
+
+        def mask(self, text):
+            CountingGuard.calls += 1
+            return text.replace("secret", "[REDACTED]")
+
+    manager = GuardManager([CountingGuard(), ToneGuard()], cache_size=0)
+    assert manager.run("secret, secret, crap") == "[REDACTED], [REDACTED], ****"
+    assert CountingGuard.calls == 1
+
+def test_manager_rescans_after_deleting_guard():
+    from safelayer.guards.tts import TTSGuard
+    cases = [
+        ([TTSGuard(), PIIGuard()], "call 9876ä543210 now", "call [PHONE MASKED] now"),
+        ([TTSGuard(), ToneGuard()], "you daémn fool", "you **** fool"),
+        ([TTSGuard(), PIIGuard()], "mail jane<script@x.com", "mail [EMAIL MASKED]"),
+    ]
+    for guards, text, expected in cases:
+        manager = GuardManager(guards)
+        assert len(manager._stages) == 2
+        assert manager.run(text) == expected
+
+def test_stage_findings_match_guard_check(monkeypatch):
+    import safelayer.manager as manager_mod
+    from safelayer.guards.tts import TTSGuard
+    text = "Damn, mail a@b.com or 9876543210 <script>x</script> ünï"
+    for guard in (PIIGuard(), ToneGuard(), TTSGuard()):
+        logged = []
+        monkeypatch.setattr(manager_mod, "audit_log_many", lambda name, findings: logged.extend(findings))
+        GuardManager([guard], cache_size=0).run(text)
+        assert logged == guard.check(text)
+
+def test_detect_only_pii_does_not_hide_text_from_later_guards():
+    from safelayer.guards.tts import TTSGuard
+    assert GuardManager([PIIGuard(mask=False), ToneGuard()]).run("damn@bar.com") == "****@bar.com"
+    assert GuardManager([PIIGuard(mask=False), TTSGuard()]).run("jané@x.com") == "jan@x.com"
+
+def test_detect_only_guard_then_masking_guard_with_same_pattern(monkeypatch):
+    import safelayer.manager as manager_mod
+    logged = []
+    monkeypatch.setattr(manager_mod, "audit_log_many", lambda name, findings: logged.append(name))
+    manager = GuardManager([PIIGuard(mask=False), PIIGuard()])
+    assert manager.run("a@b.com 9876543210") == "[EMAIL MASKED] [PHONE MASKED]"
+    assert len(logged) == 2
+
+def test_manager_guards_are_fixed_at_construction():
+    import pytest
+    guards = [PIIGuard()]
+    manager = GuardManager(guards)
+    guards.append(ToneGuard())
+    assert manager.guards == tuple(guards[:1])
+    assert manager.run("damn") == "damn"
+    with pytest.raises(AttributeError):
+        manager.guards.append(ToneGuard())
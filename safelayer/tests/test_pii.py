@@ -18,3 +18,16 @@ def test_check_email_and_phone():
     findings = guard.check(input_str)
     assert any('email' in d['entity'] or 'EMAIL_ADDRESS' in d['entity'] for d in findings)
     assert any('phone' in d['entity'] or 'PHONE_NUMBER' in d['entity'] for d in findings)
+
+def test_mask_disabled_keeps_text():
+    guard = PIIGuard(mask=False)
+    input_str = "john@foo.com 9876543210"
+    assert guard.mask(input_str) == input_str
+    assert len(guard.check(input_str)) == 2
+
+def test_clean_and_phone_only_text():
+    guard = PIIGuard()
+    clean = "Nothing sensitive here."
+    assert guard.mask(clean) is clean
+    assert guard.check(clean) == []
+    assert guard.mask("id 1234 or 9876543210") == "id 1234 or [PHONE MASKED]"
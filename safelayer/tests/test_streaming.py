@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from safelayer.guards.base import BaseGuard
+from safelayer.guards.pii import PIIGuard
+from safelayer.guards.tone import ToneGuard
+from safelayer.guards.tts import TTSGuard
+from safelayer.manager import GuardManager
+from safelayer.streaming import MAX_HOLD, StreamSession
+
+_FRAGMENTS = ["jane.doe", "@", "example.com", "9876543210", "damn", "crap", "<", ">", "<b",
+              "script", "x", ".", "é", "ünï", " ", " ", "\n", "\t"]
+
+def test_stream_session_matches_whole_text_run():
+    rng = random.Random(20)
+    for guards in ([PIIGuard(), ToneGuard(), TTSGuard()], [TTSGuard(), PIIGuard(), ToneGuard()]):
+        manager = GuardManager(guards, cache_size=0)
+        for _ in range(500):
+            text = "".join(rng.choice(_FRAGMENTS) for _ in range(rng.randint(1, 40)))
+            session = StreamSession(manager)
+            streamed, i = [], 0
+            while i < len(text):
+                step = rng.randint(1, 8)
+                streamed.append(session.feed(text[i:i + step]))
+                i += step
+            streamed.append(session.close())
+            assert "".join(streamed) == manager.run(text), repr(text)
+
+def test_stream_session_never_cuts_inside_a_tag():
+    session = StreamSession(GuardManager([TTSGuard()]))
+    assert session.feed("ok <b class") == "ok "
+    assert session.feed("=x script>") == ""
+    assert session.close() == ">"
+
+def test_stream_session_rejects_guards_that_are_not_stream_safe():
+    class AnyGuard(BaseGuard):
+        def check(self, text):
+            return []
+
+        def mask(self, text):
+            return text
+
+    with pytest.raises(ValueError, match="AnyGuard"):
+        StreamSession(GuardManager([ToneGuard(), AnyGuard()]))
+
+def test_stream_session_holds_back_unsettled_tail():
+    session = StreamSession(GuardManager([PIIGuard()]))
+    assert session.feed("reach me at jane@exa") == "reach me at "
+    assert session.feed("mple.com ") == "[EMAIL MASKED] "
+    assert session.close() == ""
+
+def test_stream_session_rejects_tail_past_max_hold():
+    session = StreamSession(GuardManager([PIIGuard()]))
+    assert session.feed("a" * (MAX_HOLD - 10) + ",jane@exa") == ""
+    assert session.feed("mple.com ") == "a" * (MAX_HOLD - 10) + ",[EMAIL MASKED] "
+    with pytest.raises(ValueError):
+        session.feed("a" * 4090 + "-jane@exa")
+    assert session.feed("mple.com ") == "mple.com "
+    session = StreamSession(GuardManager([TTSGuard()]))
+    with pytest.raises(ValueError):
+        session.feed("<b " + "x" * 4100)
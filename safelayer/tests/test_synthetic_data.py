@@ -0,0 +1,31 @@
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "synthetic_tests"))
+import test_data_generator as gen  # noqa: E402
+
+def _generate(monkeypatch, numpy, n, seed=7):
+    monkeypatch.setattr(gen, "NUMPY", numpy)
+    random.seed(seed)
+    return gen.generate_dataset(n)
+
+def test_loop_and_numpy_paths_agree(monkeypatch):
+    if not gen.NUMPY:
+        pytest.skip("numpy not installed")
+    loop, vectorized = _generate(monkeypatch, False, 4000), _generate(monkeypatch, True, 4000)
+    assert len(loop) == len(vectorized) == 4000
+    assert all(row.keys() == {"text", "label"} for row in loop + vectorized)
+    assert {row["label"] for row in loop} == {row["label"] for row in vectorized}
+    assert {row["text"] for row in loop} == {row["text"] for row in vectorized}
+    assert {(row["text"], row["label"]) for row in loop} == {(row["text"], row["label"]) for row in vectorized}
+
+@pytest.mark.parametrize("numpy", [False, True])
+def test_random_seed_reproduces_dataset(monkeypatch, numpy):
+    if numpy and not gen.NUMPY:
+        pytest.skip("numpy not installed")
+    assert _generate(monkeypatch, numpy, 50) == _generate(monkeypatch, numpy, 50)
+    assert _generate(monkeypatch, numpy, 50) != _generate(monkeypatch, numpy, 50, seed=8)
+    assert _generate(monkeypatch, numpy, 0) == _generate(monkeypatch, numpy, -1) == []
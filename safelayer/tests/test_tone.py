@@ -12,3 +12,20 @@ def test_check_profane_word():
     findings = guard.check(input_str)
     assert any('profanity' in d['entity'] for d in findings)
     assert any('Damn' in d['explanation'] for d in findings)
+
+def test_explain_action_writes_immediately_without_manager(capsys):
+    guard = ToneGuard(explain=True)
+    for finding in guard.check("damn crap"):
+        guard.explain_action(finding)
+    assert capsys.readouterr().err.count("[ToneGuard][EXPLAIN]") == 2
+
+def test_automaton_matches_regex_folding():
+    import pytest
+    from safelayer.guards import tone
+    if not tone.AHOCORASICK:
+        pytest.skip("pyahocorasick not installed")
+    guard = ToneGuard()
+    for text in ("ſhit happens", "DAMN, crapdamn _fuck fuck!", "İ damn", "café crap"):
+        assert [(f["start"], f["end"]) for f in guard.check(text)] == \
+            [m.span() for m in tone.PROF_RE.finditer(text)]
+        assert guard.mask(text) == tone.PROF_RE.sub("****", text)
@@ -0,0 +1,42 @@
+from safelayer.guards.tts import TTSGuard
+
+def test_script_and_non_ascii_removed():
+    guard = TTSGuard()
+    masked = guard.mask("Hi <SCRIPT>go()</script> Ένα!")
+    assert "script" not in masked.lower()
+    assert masked.isascii()
+
+def test_check_reports_each_pattern():
+    guard = TTSGuard()
+    findings = guard.check("<script>x</script> café")
+    patterns = {d['pattern'] for d in findings}
+    assert patterns == {r'<[^<>]*script', r'[^\x00-\x7F]+'}
+
+def test_check_clean_ascii_text():
+    guard = TTSGuard()
+    assert guard.check("Plain text, no tags.") == []
+    assert [d['pattern'] for d in guard.check("a < b ü")] == [r'[^\x00-\x7F]+']
+
+def test_mask_fast_paths():
+    guard = TTSGuard()
+    clean = "Plain text, no tags."
+    assert guard.mask(clean) is clean
+    assert guard.mask("a <b> <script>") == "a <b> >"
+    assert guard.mask("naïve") == "nave"
+
+def test_ascii_folding_code_points_removed():
+    from safelayer.manager import GuardManager
+    guard = TTSGuard()
+    for text in ("K", "<b>ſx"):
+        assert guard.mask(text).isascii()
+        assert GuardManager([guard]).run(text).isascii()
+
+def test_unclosed_tag_scan_is_bounded():
+    import time
+    from safelayer.manager import GuardManager
+    text = "<a" * 8000 + "é"
+    start = time.perf_counter()
+    assert TTSGuard().mask(text) == "<a" * 8000
+    assert GuardManager([TTSGuard()], cache_size=0).run(text) == "<a" * 8000
+    assert time.perf_counter() - start < 0.5
+    assert TTSGuard().mask("<a <b script> ok") == "<a > ok"
@@ -6,6 +6,12 @@ from __future__ import annotations
 import random
 from typing import List, Dict
 
+try:
+    import numpy as np
+    NUMPY = True
+except ImportError:
+    NUMPY = False
+
 PII_EMAILS = [
     "alice@example.com", "bob.smith@gmail.com", "carol_jones@acme.co",
 ]
@@ -31,25 +37,95 @@ def random_toxic_word() -> str:
     return random.choice(TOXIC_WORDS)
 
 
-def make_sample(include_email=True, include_phone=True, include_toxic=True) -> str:
+def _compose(email=None, phone=None, toxic=None, clean=None) -> str:
+    """Sample text from its parts; ``clean`` is only used when the rest are all None."""
     parts: List[str] = []
-    if include_email:
-        parts.append(f"Email me at {random_email()}")
-    if include_phone:
-        parts.append(f"Call me at {random_phone()}")
-    if include_toxic:
-        parts.append(f"This is {random_toxic_word()}!")
+    if email is not None:
+        parts.append(f"Email me at {email}")
+    if phone is not None:
+        parts.append(f"Call me at {phone}")
+    if toxic is not None:
+        parts.append(f"This is {toxic}!")
     if not parts:
-        parts.append(random.choice(CLEAN_SENTENCES))
+        parts.append(clean)
     return " ".join(parts)
 
 
+def make_sample(include_email=True, include_phone=True, include_toxic=True) -> str:
+    return _compose(
+        random_email() if include_email else None,
+        random_phone() if include_phone else None,
+        random_toxic_word() if include_toxic else None,
+        None if include_email or include_phone or include_toxic else random.choice(CLEAN_SENTENCES),
+    )
+
+
+# Sample kinds drawn by the vectorized generator, in generate_dataset's branch order.
+_EMAIL, _PHONE, _TONE, _CLEAN, _MIXED = range(5)
+_LABELS = ["pii", "pii", "tone", "clean", "mixed"]
+
+
+def _render(kind: int, email: int, phone: int, toxic: int, clean: int) -> str:
+    return _compose(
+        PII_EMAILS[email] if kind in (_EMAIL, _MIXED) else None,
+        PII_PHONES[phone] if kind in (_PHONE, _MIXED) else None,
+        TOXIC_WORDS[toxic] if kind in (_TONE, _MIXED) else None,
+        CLEAN_SENTENCES[clean],
+    )
+
+
+def _sample_table():
+    """Every text the generator can emit, plus where each kind's block starts.
+
+    Mixed samples are laid out email-major, then phone, then toxic word.
+    """
+    counts = (len(PII_EMAILS), len(PII_PHONES), len(TOXIC_WORDS), len(CLEAN_SENTENCES))
+    texts = [_render(_EMAIL, e, 0, 0, 0) for e in range(counts[0])]
+    texts += [_render(_PHONE, 0, p, 0, 0) for p in range(counts[1])]
+    texts += [_render(_TONE, 0, 0, t, 0) for t in range(counts[2])]
+    texts += [_render(_CLEAN, 0, 0, 0, c) for c in range(counts[3])]
+    offsets = [0, counts[0], counts[0] + counts[1], counts[0] + counts[1] + counts[2], len(texts)]
+    texts += [_render(_MIXED, e, p, t, 0)
+              for e in range(counts[0]) for p in range(counts[1]) for t in range(counts[2])]
+    return texts, offsets
+
+
+def _generate_dataset_numpy(n: int) -> List[Dict[str, str]]:
+    """Same distribution as the loop below, with every random draw done in one NumPy call.
+
+    Each row's text is looked up in a precomputed table by a vectorized index,
+    so no per-row Python branching or string formatting remains. The
+    generator is seeded from ``random`` so ``random.seed`` still makes the
+    dataset reproducible.
+    """
+    if n <= 0:
+        return []
+    rng = np.random.default_rng(random.getrandbits(64))
+    kinds = np.searchsorted([0.25, 0.5, 0.75], rng.random(n), side="right")
+    kinds = np.where((kinds == _CLEAN) & (rng.random(n) >= 0.5), _MIXED, kinds)
+    email = rng.integers(0, len(PII_EMAILS), n)
+    phone = rng.integers(0, len(PII_PHONES), n)
+    toxic = rng.integers(0, len(TOXIC_WORDS), n)
+    clean = rng.integers(0, len(CLEAN_SENTENCES), n)
+
+    texts, offsets = _sample_table()
+    mixed = (email * len(PII_PHONES) + phone) * len(TOXIC_WORDS) + toxic
+    within = np.choose(kinds, [email, phone, toxic, clean, mixed])
+    rows = np.asarray(offsets)[kinds] + within
+    text_col = np.array(texts, dtype=object)[rows].tolist()
+    label_col = np.array(_LABELS, dtype=object)[kinds].tolist()
+    return [{"text": text, "label": label} for text, label in zip(text_col, label_col)]
+
+
 def generate_dataset(n: int = 50) -> List[Dict[str, str]]:
     """Generate a mixed dataset of synthetic samples.
 
     Returns list of dicts: {"text": str, "label": str}
     Labels: pii, tone, mixed, clean
     """
+    if NUMPY:
+        return _generate_dataset_numpy(n)
+
     data: List[Dict[str, str]] = []
 
     for _ in range(n):
@@ -90,8 +166,7 @@ def main():
     os.makedirs(os.path.dirname(args.out), exist_ok=True)
 
     with open(args.out, "w", encoding="utf-8") as f:
-        for row in ds:
-            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        f.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in ds))
 
     print(f"Wrote {len(ds)} samples to {args.out}")
 